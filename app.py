@@ -1,65 +1,390 @@
 # medical_report_explainer.py
-from flask import Flask, request, render_template_string, jsonify
-import google.generativeai as genai
 import os
+# Multi-page scans are OCR'd one page per process; keep each Tesseract single-threaded.
+# Must be set before tesserocr loads libtesseract/OpenMP, which read it only at load time.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+from flask import Flask, request, jsonify, make_response
+from flask_compress import Compress
+import google.generativeai as genai
 import docx
 from PIL import Image
+import numpy as np
 import pytesseract
-from pdfminer.high_level import extract_text
-from pdf2image import convert_from_path
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+import fitz
+from charset_normalizer import from_bytes
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict, deque
+import hashlib
+import io
+import json
+import multiprocessing
+import threading
+import time
+import uuid
 
 app = Flask(__name__)
+app.config.update(
+    COMPRESS_MIMETYPES=['text/html', 'application/json', 'text/css', 'application/javascript'],
+    COMPRESS_LEVEL=6,
+    COMPRESS_MIN_SIZE=500,
+    # Uploads are held in memory until their job runs, so cap each request.
+    MAX_CONTENT_LENGTH=20 * 1024 * 1024,
+)
+Compress(app)
 
 # Gemini API Key
 API_KEY = os.getenv("GEMINI_API_KEY", "YOUR_API_KEY_HERE")
 genai.configure(api_key=API_KEY)
+GEMINI_MODEL = genai.GenerativeModel("gemini-flash-latest")
 
 # Tesseract OCR Path
 TESSERACT_PATH = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 if os.path.exists(TESSERACT_PATH):
     pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
 
-explains_history = []
+_ocr_local = threading.local()
+
+def binarize_for_ocr(image):
+    """Grayscale + Otsu threshold in one lookup-table pass over the pixels."""
+    if 'A' in image.getbands() or (image.mode == 'P' and 'transparency' in image.info):
+        # Flatten onto white like pytesseract did; convert('L') would turn clear pixels black.
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    elif image.mode.startswith('I'):
+        # 16/32-bit scans would be clipped to 255 by convert('L'); scale the range down instead.
+        wide = np.asarray(image, dtype=np.float64)
+        lo, hi = wide.min(), wide.max()
+        scaled = (wide - lo) * (255.0 / (hi - lo)) if hi > lo else np.zeros_like(wide)
+        image = Image.fromarray(scaled.astype(np.uint8))
+    gray = np.asarray(image if image.mode == 'L' else image.convert('L'))
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    omega = np.cumsum(hist) / hist.sum()
+    mu = np.cumsum(hist * np.arange(256)) / hist.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        between_var = (mu[-1] * omega - mu) ** 2 / (omega * (1 - omega))
+    threshold = int(np.argmax(np.nan_to_num(between_var)))
+    lut = np.where(np.arange(256) > threshold, 255, 0).astype(np.uint8)
+    return Image.fromarray(lut[gray])
+
+def ocr_image(image, ocr_lang="eng"):
+    """OCR a PIL image, reusing one tesserocr API per thread and language when available."""
+    image = binarize_for_ocr(image)
+    if tesserocr is None:
+        return pytesseract.image_to_string(image, lang=ocr_lang, config='--psm 6')
+    apis = getattr(_ocr_local, "apis", None)
+    if apis is None:
+        apis = _ocr_local.apis = {}
+    api = apis.get(ocr_lang)
+    if api is None:
+        api = apis[ocr_lang] = tesserocr.PyTessBaseAPI(lang=ocr_lang, psm=tesserocr.PSM.SINGLE_BLOCK)
+    api.SetImage(image)
+    return api.GetUTF8Text()
+
+MAX_OCR_PAGES = 30
+OCR_PAGES_IN_FLIGHT = os.cpu_count() or 1
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+def get_ocr_pool():
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # Never fork from the threaded server: a lock held by another thread would deadlock the child.
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _ocr_pool = ProcessPoolExecutor(max_workers=OCR_PAGES_IN_FLIGHT, mp_context=multiprocessing.get_context(start_method))
+    return _ocr_pool
+
+def reset_ocr_pool(broken_pool):
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is broken_pool:
+            _ocr_pool = None
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+def ocr_page_in_worker(image, ocr_lang="eng"):
+    try:
+        return ocr_image(image, ocr_lang)
+    except Exception as e:
+        # Some pytesseract errors (e.g. TesseractNotFoundError) can't be unpickled and would break the pool.
+        raise RuntimeError(str(e)) from None
+
+def ocr_pages(render_page, page_count, ocr_lang="eng"):
+    """OCR pages in order, spreading multi-page scans over the process pool."""
+    # render_page(i) is called only as workers free up, so at most one rendered page per worker is in memory.
+    if page_count <= 1:
+        return [ocr_image(render_page(i), ocr_lang) for i in range(page_count)]
+    # A worker that died (segfault, OOM kill) breaks the whole pool; rebuild it and retry once.
+    # Not retried inline: a page that crashes Tesseract would take the web process down with it.
+    for attempt in range(2):
+        pool = get_ocr_pool()
+        in_flight, texts = deque(), []
+        try:
+            for i in range(page_count):
+                if len(in_flight) >= OCR_PAGES_IN_FLIGHT:
+                    texts.append(in_flight.popleft().result())
+                in_flight.append(pool.submit(ocr_page_in_worker, render_page(i), ocr_lang))
+            texts.extend(future.result() for future in in_flight)
+            return texts
+        except BrokenProcessPool:
+            reset_ocr_pool(pool)
+            if attempt: raise
+        finally:
+            for future in in_flight: future.cancel()
+
+explains_history = deque(maxlen=5)
+history_lock = threading.Lock()
+
+# ----- Request Options -----
+OCR_LANG_MAP = {
+    "English": "eng", "Hindi": "hin", "French": "fra", "Spanish": "spa",
+    "German": "deu", "Chinese": "chi_sim", "Japanese": "jpn"
+}
+LENGTH_MAP = {
+    "short": "brief (3-4 bullet points)",
+    "medium": "moderate length (5-7 bullet points)",
+    "long": "detailed (10+ bullet points)"
+}
+# Legacy encodings tried for non-UTF-8 .txt uploads, keyed by OCR language. EUC-JP goes before
+# cp932 because EUC-JP bytes often decode as cp932 half-width katakana without an error.
+LEGACY_TEXT_ENCODINGS = {
+    "eng": ("cp1252",), "fra": ("cp1252",), "spa": ("cp1252",), "deu": ("cp1252",),
+    "chi_sim": ("gb18030",), "jpn": ("euc_jp", "cp932")
+}
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg'})
+VALID_EXTENSIONS = frozenset({'.pdf', '.docx', '.txt'}) | IMAGE_EXTENSIONS
+
+# ----- LLM Response Cache -----
+class LLMCache:
+    """In-memory LRU cache of Gemini explanations with a per-entry TTL."""
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(output_lang, summary_length, extracted_text):
+        payload = json.dumps({"lang": output_lang, "len": summary_length, "text": extracted_text}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+llm_cache = LLMCache()
 
 # ----- Text Extraction Functions -----
-def extract_pdf_text(file_path, ocr_lang="eng"):
+def extract_pdf_text(fileobj, ocr_lang="eng"):
     try:
-        text = extract_text(file_path)
-        if text.strip(): return text
-        images = convert_from_path(file_path, first_page=1, last_page=1)
-        ocr_text = ""
-        for img in images:
-            ocr_text += pytesseract.image_to_string(img, lang=ocr_lang, config='--psm 6') + "\n"
+        with fitz.open(stream=fileobj, filetype="pdf") as doc:
+            text = "\n".join(page.get_text() for page in doc)
+            if text.strip(): return text
+            if doc.page_count > MAX_OCR_PAGES:
+                return f"⚠️ Scanned PDF has {doc.page_count} pages; at most {MAX_OCR_PAGES} can be OCR'd."
+
+            def render_page(i):
+                # 150 DPI grayscale is plenty for printed reports and is what OCR binarizes anyway.
+                pix = doc[i].get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+                return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+            pages = ocr_pages(render_page, doc.page_count, ocr_lang)
+        ocr_text = "".join(page + "\n" for page in pages)
         return ocr_text if ocr_text.strip() else "⚠️ No readable text found."
     except Exception as e:
         return f"⚠️ Error extracting PDF text: {str(e)}"
 
-def extract_docx_text(file_path):
+def extract_docx_text(fileobj):
     try:
-        doc = docx.Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
+        doc = docx.Document(fileobj)
+        return "\n".join(para.text for para in doc.paragraphs if para.text)
     except Exception as e:
         return f"⚠️ Error extracting DOCX: {str(e)}"
 
-def extract_image_text(file_path, ocr_lang="eng"):
+def extract_txt_text(fileobj, ocr_lang="eng"):
+    try:
+        data = fileobj.read()
+        try:
+            return data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            pass
+        # Non-UTF-8 exports are common. The detector misreads short CJK text as cp949 and cp1252 as
+        # cp1250, so try the legacy codecs of the declared input language first.
+        for encoding in LEGACY_TEXT_ENCODINGS.get(ocr_lang, ()):
+            try:
+                return data.decode(encoding)
+            except UnicodeDecodeError:
+                continue
+        best = from_bytes(data).best()
+        return str(best) if best is not None else data.decode("utf-8", errors="replace")
+    except Exception as e:
+        return f"⚠️ Error reading TXT: {str(e)}"
+
+def extract_image_text(fileobj, ocr_lang="eng"):
     try:
-        image = Image.open(file_path)
-        image.thumbnail((1000, 1000))
-        text = pytesseract.image_to_string(image, lang=ocr_lang, config='--psm 6')
+        image = Image.open(fileobj)
+        # Lets JPEGs decode straight to grayscale at 1/2-1/8 scale; a no-op for other formats.
+        image.draft('L', (1000, 1000))
+        if max(image.size) > 1000: image.thumbnail((1000, 1000))
+        text = ocr_image(image, ocr_lang)
         return text if text.strip() else "⚠️ OCR did not detect any text."
     except Exception as e:
         return f"⚠️ OCR error: {str(e)}"
 
+# ----- Prompt Bounding -----
+MAX_REPORT_TOKENS = 8000
+REPORT_CHUNK_TOKENS = 6000
+MAX_REDUCE_ROUNDS = 3
+
+def split_report(text, chunk_chars):
+    """Pack lines into chunks of at most chunk_chars, breaking overlong lines at spaces."""
+    chunks, current = [], ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > chunk_chars:
+            cut = line.rfind(" ", 0, chunk_chars) + 1 or chunk_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:cut])
+            line = line[cut:]
+        if current and len(current) + len(line) > chunk_chars:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current: chunks.append(current)
+    return chunks
+
+def condense_report(model, text):
+    """Map-reduce oversized reports into bullet summaries so the final prompt stays bounded."""
+    # Only skip counting when even 4 tokens per character would fit (byte-fallback scripts can exceed 1).
+    if len(text) <= MAX_REPORT_TOKENS // 4: return text
+
+    def summarize(chunk):
+        return model.generate_content(
+            f"Summarize this part of a medical report as bullet points, keeping every test name, value, unit and reference range:\n\n{chunk}"
+        ).text
+
+    for _ in range(MAX_REDUCE_ROUNDS):
+        total_tokens = model.count_tokens(text).total_tokens
+        if total_tokens <= MAX_REPORT_TOKENS: return text
+        chunks = split_report(text, max(1, len(text) * REPORT_CHUNK_TOKENS // total_tokens))
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as pool:
+            text = "\n\n".join(pool.map(summarize, chunks))
+
+    # Summaries that still don't fit after several rounds are cut rather than sent unbounded.
+    total_tokens = model.count_tokens(text).total_tokens
+    if total_tokens > MAX_REPORT_TOKENS:
+        text = text[:len(text) * MAX_REPORT_TOKENS // total_tokens]
+    return text
+
+# ----- Background Jobs -----
+JOB_TTL = 600
+jobs = {}
+jobs_lock = threading.Lock()
+MAX_PENDING_JOBS = 32
+job_executor = ThreadPoolExecutor(max_workers=8)
+# Counts queued + running jobs; ThreadPoolExecutor's own queue is unbounded.
+job_slots = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+
+def update_job(job_id, **fields):
+    with jobs_lock:
+        jobs[job_id].update(fields, updated=time.monotonic())
+
+def run_job(job_id, file_data, file_ext, text_input, ocr_lang, output_lang, summary_length, timestamp):
+    update_job(job_id, state="running")
+    extracted_text = ""
+    if file_data is not None:
+        fileobj = io.BytesIO(file_data)
+        try:
+            if file_ext == '.pdf': extracted_text = extract_pdf_text(fileobj, ocr_lang)
+            elif file_ext == '.docx': extracted_text = extract_docx_text(fileobj)
+            elif file_ext == '.txt': extracted_text = extract_txt_text(fileobj, ocr_lang)
+            elif file_ext in IMAGE_EXTENSIONS: extracted_text = extract_image_text(fileobj, ocr_lang)
+        except Exception as e:
+            extracted_text = f"⚠️ Error reading file: {str(e)}"
+    elif text_input:
+        extracted_text = text_input
+
+    if extracted_text.startswith("⚠️"):
+        update_job(job_id, state="error", error_msg=extracted_text)
+        return
+
+    if extracted_text.strip():
+        length_description = LENGTH_MAP.get(summary_length, LENGTH_MAP["medium"])
+
+        cache_key = LLMCache.make_key(output_lang, summary_length, extracted_text)
+        explanation = llm_cache.get(cache_key)
+        if explanation is not None:
+            update_job(job_id, explanation=explanation)
+        else:
+            parts = []
+            try:
+                report_text = condense_report(GEMINI_MODEL, extracted_text)
+                stream = GEMINI_MODEL.generate_content(
+                    f"Explain the following medical report in {output_lang} in {length_description} with simple language and highlights:\n\n{report_text}",
+                    stream=True
+                )
+                for chunk in stream:
+                    parts.append(chunk.text)
+                    update_job(job_id, explanation="".join(parts))
+            except Exception as e:
+                update_job(job_id, state="error", error_msg=f"⚠️ Explanation error: {str(e)}")
+                return
+            explanation = "".join(parts)
+            llm_cache.set(cache_key, explanation)
+        with history_lock:
+            explains_history.append({
+                "timestamp": timestamp,
+                "explanation": explanation,
+                "language": output_lang
+            })
+    with history_lock:
+        history = list(explains_history)
+    update_job(job_id, state="done", explains_history=history)
+
 # ----- Routes -----
+# The page only changes between deployments, so hash it once for a stable ETag across restarts.
+with open(os.path.join(app.static_folder, "index.html"), "rb") as f:
+    INDEX_HTML = f.read()
+INDEX_ETAG = hashlib.md5(INDEX_HTML).hexdigest()
+
 @app.route("/", methods=["GET"])
 def index():
-    return render_template_string(html_code, explains_history=explains_history)
+    response = make_response(INDEX_HTML)
+    response.set_etag(INDEX_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response.make_conditional(request)
+
+@app.route("/history", methods=["GET"])
+def history():
+    with history_lock:
+        return jsonify({"explains_history": list(explains_history)})
 
 @app.route("/process", methods=["POST"])
 def process():
-    explanation = ""
-    error_msg = ""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     text_input = request.form.get("text_input")
@@ -68,176 +393,48 @@ def process():
     output_lang = request.form.get("output_lang") or "English"
     summary_length = request.form.get("summary_length", "medium")
 
-    ocr_lang_map = {
-        "English": "eng", "Hindi": "hin", "French": "fra", "Spanish": "spa",
-        "German": "deu", "Chinese": "chi_sim", "Japanese": "jpn"
-    }
-    ocr_lang = ocr_lang_map.get(input_lang, "eng")
+    ocr_lang = OCR_LANG_MAP.get(input_lang, "eng")
 
-    extracted_text = ""
+    job_id = uuid.uuid4().hex
+    file_data = file_ext = None
     if uploaded_file:
         file_ext = os.path.splitext(uploaded_file.filename)[1].lower()
-        valid_extensions = {'.pdf', '.docx', '.txt', '.png', '.jpg', '.jpeg'}
-        if file_ext not in valid_extensions:
-            error_msg = f"⚠️ Unsupported file type: {file_ext}"
-        else:
-            file_path = os.path.join("Uploads", uploaded_file.filename)
-            try:
-                uploaded_file.save(file_path)
-                if file_ext == '.pdf': extracted_text = extract_pdf_text(file_path, ocr_lang)
-                elif file_ext == '.docx': extracted_text = extract_docx_text(file_path)
-                elif file_ext == '.txt': extracted_text = open(file_path,"r",encoding="utf-8").read()
-                elif file_ext in {'.png','.jpg','.jpeg'}: extracted_text = extract_image_text(file_path, ocr_lang)
-            finally:
-                if os.path.exists(file_path): os.remove(file_path)
-    elif text_input:
-        extracted_text = text_input
+        if file_ext not in VALID_EXTENSIONS:
+            return jsonify({"error_msg": f"⚠️ Unsupported file type: {file_ext}"}), 400
 
-    if extracted_text.strip() and not extracted_text.startswith("⚠️"):
-        try:
-            length_map = {
-                "short": "brief (3-4 bullet points)",
-                "medium": "moderate length (5-7 bullet points)",
-                "long": "detailed (10+ bullet points)"
-            }
-            length_description = length_map.get(summary_length, "moderate length (5-7 bullet points)")
-
-            model = genai.GenerativeModel("gemini-flash-latest")
-            response = model.generate_content(
-                f"Explain the following medical report in {output_lang} in {length_description} with simple language and highlights:\n\n{extracted_text}"
-            )
-            explanation = response.text
-            explains_history.append({
-                "timestamp": timestamp,
-                "explanation": explanation,
-                "language": output_lang
-            })
-            if len(explains_history) > 5: explains_history.pop(0)
-        except Exception as e:
-            error_msg = f"⚠️ Explanation error: {str(e)}"
-    elif extracted_text.startswith("⚠️"):
-        error_msg = extracted_text
+    if not job_slots.acquire(blocking=False):
+        return jsonify({"error_msg": "⚠️ Server is busy, please try again shortly."}), 503
+    if uploaded_file:
+        file_data = uploaded_file.read()
 
-    return jsonify({
-        "explanation": explanation,
-        "error_msg": error_msg,
-        "explains_history": explains_history
-    })
+    now = time.monotonic()
+    with jobs_lock:
+        for stale_id in [k for k, job in jobs.items() if job["state"] in ("done", "error") and now - job["updated"] > JOB_TTL]:
+            del jobs[stale_id]
+        jobs[job_id] = {"state": "queued", "explanation": "", "error_msg": "", "explains_history": [], "updated": now}
+    future = job_executor.submit(run_job, job_id, file_data, file_ext, text_input, ocr_lang, output_lang, summary_length, timestamp)
+    future.add_done_callback(lambda _: job_slots.release())
+    return jsonify({"job_id": job_id}), 202
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    return jsonify({"error_msg": f"⚠️ File too large (limit {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB)."}), 413
+
+@app.route("/status/<job_id>", methods=["GET"])
+def status(job_id):
+    with jobs_lock:
+        job = jobs.get(job_id)
+        snapshot = {k: v for k, v in job.items() if k != "updated"} if job else None
+    if snapshot is None:
+        return jsonify({"state": "error", "error_msg": "⚠️ Unknown or expired job."}), 404
+    return jsonify(snapshot)
 
 @app.route("/clear_history", methods=["POST"])
 def clear_history():
-    explains_history.clear()
-    return jsonify({"explains_history": explains_history})
-
-# ----- HTML + CSS + JS -----
-html_code = """ 
-<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>🩺 Medical Report Explainer</title>
-<link href="https://fonts.googleapis.com/css2?family=Roboto:wght@400;500;700&display=swap" rel="stylesheet">
-<script src="https://cdn.jsdelivr.net/npm/particles.js@2.0.0/particles.min.js"></script>
-<style>
-body { font-family:'Roboto',sans-serif; margin:0; padding:0; background:#f0f8ff; transition:0.3s; }
-#particles-js { position:fixed; top:0; left:0; width:100%; height:100vh; z-index:-1; }
-.container { max-width:900px; margin:50px auto; padding:30px; background:rgba(255,255,255,0.95); border-radius:20px; box-shadow:0 15px 40px rgba(0,0,0,0.15); }
-h2 { text-align:center; color:#ff4081; font-size:2.2em; margin-bottom:25px; animation:fadeIn 1s ease-in; }
-h2::before { content:'🩺'; margin-right:8px; display:inline-block; animation:spinGlobe 10s linear infinite; }
-textarea,input[type=file],select { width:100%; padding:14px; margin-bottom:15px; border-radius:12px; border:none; box-shadow:0 5px 15px rgba(0,0,0,0.1); font-size:1em; transition:0.3s; }
-textarea:focus,input[type=file]:focus,select:focus { outline:none; transform:translateY(-2px); box-shadow:0 8px 20px rgba(43,108,176,0.3); }
-button { padding:14px 28px; font-weight:600; border:none; border-radius:12px; cursor:pointer; background:linear-gradient(135deg,#ff6ec4,#42a5f5); color:#fff; font-size:1em; transition:all 0.3s; }
-button:hover { transform:translateY(-3px); box-shadow:0 8px 25px rgba(0,0,0,0.3); }
-#spinner { display:none; border:4px solid rgba(255,255,255,0.3); border-top:4px solid #42a5f5; border-radius:50%; width:30px; height:30px; animation:spin 1s linear infinite; margin:20px auto; }
-#explanationBox { display:none; padding:20px; border-radius:15px; background:#e0f7fa; margin-top:20px; animation:fadeInUp 0.8s ease-out; box-shadow:0 8px 25px rgba(0,0,0,0.2); }
-#explanationText span { display:block; font-weight:500; font-size:1em; background: linear-gradient(-45deg,#ff6ec4,#42a5f5,#ffea00,#ff4081); -webkit-background-clip:text; -webkit-text-fill-color:transparent; animation:colorShift 3s ease infinite; margin-bottom:5px; }
-#errorBox { display:none; padding:20px; border-radius:15px; background:#ffe0e0; margin-top:20px; color:#b71c1c; }
-.history-box { display:none; margin-top:20px; max-height:300px; overflow-y:auto; }
-.history-item { margin-bottom:15px; padding:15px; border-radius:15px; background:linear-gradient(135deg,#ffe57f,#ffd740); animation:fadeInUp 0.6s ease-out; box-shadow:0 8px 20px rgba(0,0,0,0.15); transition:transform 0.3s; }
-.history-item:hover { transform:scale(1.03); }
-@keyframes fadeIn { from{opacity:0;} to{opacity:1;} }
-@keyframes fadeInUp { from{opacity:0; transform:translateY(20px);} to{opacity:1; transform:translateY(0);} }
-@keyframes spinGlobe { from{transform:rotate(0deg);} to{transform:rotate(360deg);} }
-@keyframes spin { 0%{transform:rotate(0deg);} 100%{transform:rotate(360deg);} }
-@keyframes colorShift { 0%{background-position:0% 50%;} 50%{background-position:100% 50%;} 100%{background-position:0% 50%;} background-size:200% 200%; }
-</style>
-</head>
-<body>
-<div id="particles-js"></div>
-<div class="container">
-<h2>Medical Report Explainer</h2>
-<form id="uploadForm" enctype="multipart/form-data">
-<textarea name="text_input" rows="5" placeholder="Paste medical report here..."></textarea>
-<input type="file" name="file" accept=".pdf,.docx,.txt,.png,.jpg,.jpeg">
-<select name="input_lang">
-<option selected>English</option><option>Hindi</option><option>French</option><option>Spanish</option>
-<option>German</option><option>Chinese</option><option>Japanese</option>
-</select>
-<select name="output_lang">
-<option selected>English</option><option>Hindi</option><option>French</option><option>Spanish</option>
-<option>German</option><option>Chinese</option><option>Japanese</option>
-</select>
-<select name="summary_length">
-<option value="short" selected>Short</option>
-<option value="medium">Medium</option>
-<option value="long">Long</option>
-</select>
-<button type="submit">Explain Report</button>
-<div id="spinner"></div>
-</form>
-
-<div id="explanationBox"><h3>📝 Explanation</h3><div id="explanationText"></div></div>
-<div id="errorBox"><h3>⚠️ Error</h3><p id="errorText"></p></div>
-<div class="history-box" id="historyBox"><h3>📜 Recent Explanations</h3><div id="historyContent"></div></div>
-</div>
-
-<script>
-particlesJS('particles-js', { particles:{number:{value:90,density:{enable:true,value_area:900}},color:{value:'#ffffff'},shape:{type:'circle'},opacity:{value:0.5,random:true},size:{value:4,random:true},line_linked:{enable:true,distance:180,color:'#fff',opacity:0.25,width:1},move:{enable:true,speed:2,direction:'none',random:true,out_mode:'out'}},interactivity:{detect_on:'canvas',events:{onhover:{enable:true,mode:'repulse'},onclick:{enable:true,mode:'push'},resize:true},modes:{repulse:{distance:120,duration:0.4},push:{particles_nb:4}}},retina_detect:true});
-
-const form=document.getElementById('uploadForm');
-const explanationBox=document.getElementById('explanationBox');
-const explanationText=document.getElementById('explanationText');
-const errorBox=document.getElementById('errorBox');
-const errorText=document.getElementById('errorText');
-const spinner=document.getElementById('spinner');
-const historyBox=document.getElementById('historyBox');
-const historyContent=document.getElementById('historyContent');
-
-form.addEventListener('submit',async e=>{
-e.preventDefault();
-explanationBox.style.display='none';
-errorBox.style.display='none';
-spinner.style.display='block';
-const formData=new FormData(form);
-try{
-const response=await fetch('/process',{method:'POST',body:formData});
-const data=await response.json();
-spinner.style.display='none';
-
-if(data.error_msg){errorText.textContent=data.error_msg; errorBox.style.display='block';}
-else if(data.explanation){
-explanationText.innerHTML='';
-data.explanation.split('\\n').forEach(line=>{
-const span=document.createElement('span'); span.textContent=line; explanationText.appendChild(span);
-});
-explanationBox.style.display='block';
-}
-
-historyContent.innerHTML='';
-data.explains_history.forEach(item=>{
-const div=document.createElement('div'); div.className='history-item';
-div.innerHTML=`<p><b>Time:</b> ${item.timestamp} | <b>Language:</b> ${item.language}</p><p>${item.explanation}</p>`;
-historyContent.appendChild(div);
-});
-historyBox.style.display=data.explains_history.length?'block':'none';
-}catch(err){spinner.style.display='none'; errorText.textContent='⚠️ Network error.'; errorBox.style.display='block';}
-});
-</script>
-</body>
-</html>
-"""
+    with history_lock:
+        explains_history.clear()
+    return jsonify({"explains_history": []})
 
+# Local development only; production runs under gunicorn (see Procfile).
 if __name__=="__main__":
-    os.makedirs("Uploads", exist_ok=True)
-    app.run(debug=True)
+    app.run(debug=os.getenv("FLASK_DEBUG") == "1")
@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from app import extract_txt_text
+
+
+@pytest.mark.parametrize("text, encoding, ocr_lang", [
+    ("Patient: José Núñez — naïve “quoted” results; Hémoglobine 13.5 g/dL", "cp1252", "eng"),
+    ("José Núñez naïve", "cp1252", "spa"),
+    ("Glucose — 5.4 mmol/L", "utf-8", "eng"),
+    ("Glucose — 5.4 mmol/L", "utf-8-sig", "eng"),
+    ("患者姓名：张三，血红蛋白 135 g/L，结果正常。", "gbk", "chi_sim"),
+    ("血红蛋白正常", "gbk", "chi_sim"),
+    ("胆固醇偏高，建议复查。", "gbk", "chi_sim"),
+    ("患者名：山田太郎、ヘモグロビン 13.5 g/dL、正常範囲です。", "shift_jis", "jpn"),
+    ("血液検査", "shift_jis", "jpn"),
+    ("検査結果：異常なし", "shift_jis", "jpn"),
+    ("患者名：山田太郎", "euc_jp", "jpn"),
+])
+def test_extract_txt_text_decodes_common_encodings(text, encoding, ocr_lang):
+    assert extract_txt_text(io.BytesIO(text.encode(encoding)), ocr_lang) == text